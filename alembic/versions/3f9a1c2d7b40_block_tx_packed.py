@@ -0,0 +1,66 @@
+"""block tx packed
+
+Revision ID: 3f9a1c2d7b40
+Revises: 
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from hydb.db.base import DbPackedType
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a1c2d7b40'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created by DB() via create_all() already have the packed column and are never stamped.
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table('block'):
+        return
+
+    if isinstance({c['name']: c['type'] for c in inspector.get_columns('block')}.get('tx'), sa.LargeBinary):
+        return
+
+    op.add_column('block', sa.Column('tx_packed', sa.LargeBinary(), nullable=True))
+
+    block = sa.table(
+        'block',
+        sa.column('pkid', sa.Integer),
+        sa.column('tx', postgresql.JSONB),
+        sa.column('tx_packed', DbPackedType),
+    )
+
+    conn = op.get_bind()
+
+    for pkid, tx in conn.execute(sa.select(block.c.pkid, block.c.tx)).fetchall():
+        conn.execute(block.update().where(block.c.pkid == pkid).values(tx_packed=tx))
+
+    op.drop_column('block', 'tx')
+    op.alter_column('block', 'tx_packed', new_column_name='tx')
+
+
+def downgrade():
+    op.add_column('block', sa.Column('tx_json', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+    block = sa.table(
+        'block',
+        sa.column('pkid', sa.Integer),
+        sa.column('tx', DbPackedType),
+        sa.column('tx_json', postgresql.JSONB),
+    )
+
+    conn = op.get_bind()
+
+    for pkid, tx in conn.execute(sa.select(block.c.pkid, block.c.tx)).fetchall():
+        conn.execute(block.update().where(block.c.pkid == pkid).values(tx_json=tx))
+
+    op.drop_column('block', 'tx')
+    op.alter_column('block', 'tx_json', new_column_name='tx')
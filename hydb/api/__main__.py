@@ -17,6 +17,9 @@ from . import crud
 app: FastAPI = FastAPI()
 dbase: DB = DB()
 
+# Warm the cache so the async endpoint below never blocks the event loop.
+crud.server_info(dbase)
+
 
 @app.get("/")
 def root():
@@ -29,8 +32,8 @@ def say_hello(name: str):
 
 
 @app.get("/server/info", response_model=schemas.ServerInfo)
-def server_info():
-    return crud.server_info(db=dbase)
+async def server_info():
+    return crud.server_info(dbase)
 
 
 @app.get("/stats", response_model=schemas.Stats)
@@ -180,12 +183,12 @@ def user_addr_upd(user_pk: int, user_addr_pk: int, user_addr_update: schemas.Use
 
 @app.delete("/u/{user_pk}/a/{user_addr_pk}", response_model=schemas.DeleteResult)
 def user_addr_del(user_pk: int, user_addr_pk: int, db: DB = Depends(dbase.yield_with_session)):
-    db_user = crud.user_get_by_pkid(db, user_pk)
+    result = crud.user_addr_del(db=db, user_pk=user_pk, user_addr_pk=user_addr_pk)
 
-    if db_user is None:
-        raise HTTPException(status_code=404, detail="User not found.")
+    if result is None:
+        raise HTTPException(status_code=404, detail="UserAddr not found.")
 
-    return crud.user_addr_del(db=db, user=db_user, user_addr_pk=user_addr_pk)
+    return result
 
 
 @app.post("/u/{user_pk}/a/{user_addr_pk}/t", response_model=schemas.UserAddrTokenAdd.Result)
@@ -1,14 +1,17 @@
 import json
+from functools import lru_cache
 from typing import Optional, List
 
 from deepdiff import DeepDiff
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, select
+from sqlalchemy.orm import joinedload
 
 from hydb.db import DB
 from hydb import db as models
 from . import schemas
 
 
+@lru_cache(maxsize=1)  # Network type is fixed for the life of the process.
 def server_info(db: DB) -> schemas.ServerInfo:
     return schemas.ServerInfo(mainnet=db.rpc.mainnet)
 
@@ -27,23 +30,21 @@ def user_map(db: DB) -> schemas.UserMap:
 
 
 def user_get_by_tgid(db: DB, tg_user_id: int) -> Optional[models.User]:
-    return db.Session.query(
-        models.User
-    ).where(
-        models.User.tg_user_id == tg_user_id
-    ).one_or_none()
+    return db.Session.execute(
+        select(
+            models.User
+        ).where(
+            models.User.tg_user_id == tg_user_id
+        )
+    ).scalar_one_or_none()
 
 
 def user_get_by_pkid(db: DB, user_pk: int) -> Optional[models.User]:
-    return db.Session.query(
-        models.User
-    ).where(
-        models.User.pkid == user_pk
-    ).one_or_none()
+    return db.Session.get(models.User, user_pk)
 
 
 def user_add(db: DB, user_create: schemas.UserCreate) -> models.User:
-    return models.User.get(db, user_create.tg_user_id, create=True)
+    return models.User.make(db, user_create.tg_user_id)
 
 
 def user_del(db: DB, user_pk: int):
@@ -122,13 +123,27 @@ def user_addr_update(db: DB, user_addr: models.UserAddr, addr_update: schemas.Us
     )
 
 
-def user_addr_del(db: DB, user: models.User, user_addr_pk: int) -> schemas.DeleteResult:
+def user_addr_del(db: DB, user_pk: int, user_addr_pk: int) -> Optional[schemas.DeleteResult]:
+    user_addr: Optional[models.UserAddr] = db.Session.query(
+        models.UserAddr,
+    ).options(
+        joinedload(models.UserAddr.user)
+    ).where(
+        and_(
+            models.UserAddr.pkid == user_addr_pk,
+            models.UserAddr.user_pk == user_pk,
+        ),
+    ).one_or_none()
+
+    if user_addr is None:
+        return None
+
+    user_addr.delete(db)
+
+    # Always True here: a missing row returns None, which the endpoint turns into a 404.
     # noinspection PyArgumentList
     return schemas.DeleteResult(
-        deleted=user.addr_del(
-            db=db,
-            user_addr_pk=user_addr_pk
-        )
+        deleted=True
     )
 
 
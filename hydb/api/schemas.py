@@ -135,7 +135,14 @@ class Block(BaseModel):
         orm_mode = True
 
     def filter_tx(self, address: str):
-        return filter(lambda tx: address in list(Block.tx_yield_addrs(tx)), self.tx)
+        return Block.filter_txes(self.tx, address)
+
+    @staticmethod
+    def filter_txes(txes: List[dict], address: str):
+        return filter(lambda tx: any(a == address for a in Block.tx_yield_addrs(tx)), txes)
+
+    def filter_tx_any(self, *addresses: str):
+        return filter(lambda tx: any(a in addresses for a in Block.tx_yield_addrs(tx)), self.tx)
 
     @staticmethod
     def tx_yield_addrs(tx: dict):
@@ -237,8 +244,7 @@ class AddrBase(BaseModel):
         return self.addr_hy if self.addr_tp.value == Addr.Type.H else self.addr_hx
 
     def filter_tx(self, block: Block):
-        addr_match = lambda addrs: self.addr_hx in addrs or self.addr_hy in addrs
-        return filter(lambda tx: addr_match(list(Block.tx_yield_addrs(tx))), block.tx)
+        return block.filter_tx_any(self.addr_hx, self.addr_hy)
 
     @staticmethod
     def soft_validate(address: str, testnet: Optional[bool] = None) -> Optional[Type]:
@@ -1,12 +1,12 @@
 from __future__ import annotations
 import enum
 from functools import lru_cache
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Set
 import binascii
 from attrdict import AttrDict
 from deepdiff import DeepDiff
 
-from sqlalchemy import Column, String, Enum, Integer
+from sqlalchemy import Column, String, Enum, Integer, func
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.orm import relationship
 
@@ -79,6 +79,11 @@ class Addr(Base):
         single_parent=True,
     )
 
+    # In-process copy of all stored addresses, used to skip lookups for blocks with no tracked addresses.
+    _tracked_hy: Set[str] = set()
+    _tracked_hx: Set[str] = set()
+    _tracked_pkid_max: Optional[int] = None
+
     def __str__(self):
         return self.addr_hy if self.addr_tp == Addr.Type.H else self.addr_hx
 
@@ -230,6 +235,31 @@ class Addr(Base):
             addr.__on_new_addr(db)
             return addr
 
+    @staticmethod
+    def tracked_load(db: DB) -> None:
+        """Reload the in-process tracked address sets when addresses were added.
+
+        Addresses are added by the API process, and pkids are never reused, so a
+        new max(pkid) means the sets are stale. Removed addresses only cause extra
+        lookups until the next reload, so they do not trigger one.
+        """
+        pkid_max = db.Session.query(func.max(Addr.pkid)).scalar()
+
+        if Addr._tracked_pkid_max is not None and pkid_max == Addr._tracked_pkid_max:
+            return
+
+        rows = db.Session.query(Addr.addr_hy, Addr.addr_hx).all()
+
+        Addr._tracked_hy = {row.addr_hy for row in rows}
+        Addr._tracked_hx = {row.addr_hx for row in rows}
+        Addr._tracked_pkid_max = pkid_max
+
+    @staticmethod
+    def tracked_filter(addresses_hy: Set[str], addresses_hx: Set[str]) -> Tuple[Set[str], Set[str]]:
+        """Reduce address sets to the ones that are tracked.
+        """
+        return addresses_hy & Addr._tracked_hy, addresses_hx & Addr._tracked_hx
+
     @staticmethod
     @lru_cache(maxsize=None)
     def validate(db: DB, address: str):
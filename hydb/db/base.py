@@ -1,13 +1,16 @@
+import msgpack
+import zstandard
 from attrdict import AttrDict
-from sqlalchemy import Column, DateTime, func, Integer, Sequence, Index, MetaData
+from sqlalchemy import Column, DateTime, func, Integer, Sequence, Index, MetaData, LargeBinary
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy_json import mutable_json_type
 
 __all__ = (
     "Base",
     "DbPkidColumn", "DbDateCreateColumn", "DbDateUpdateColumn",
-    "DbInfoColumn", "DbDataColumn",
+    "DbInfoColumn", "DbDataColumn", "DbPackedColumn",
     "DbInfoColumnIndex",
 )
 
@@ -25,6 +28,30 @@ DbInfoColumn = lambda default=...: Column(mutable_json_type(dbtype=JSONB, nested
 DbDataColumn = lambda default=None: Column(mutable_json_type(dbtype=JSONB, nested=True), nullable=True, default=default)
 
 
+class DbPackedType(TypeDecorator):
+    """Write-once data stored as zstd-compressed msgpack. Not mutation-tracked.
+    """
+    impl = LargeBinary
+    cache_ok = True
+
+    ZSTD_LEVEL = 3
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+
+        return zstandard.ZstdCompressor(level=DbPackedType.ZSTD_LEVEL).compress(msgpack.packb(value))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+
+        return msgpack.unpackb(zstandard.ZstdDecompressor().decompress(value))
+
+
+DbPackedColumn = lambda default=None: Column(DbPackedType, nullable=True, default=default)
+
+
 def DbInfoColumnIndex(table_name: str, column_name: str = "info"):
     return Index(
         f"{table_name}_{column_name}_idx",
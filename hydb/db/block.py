@@ -1,15 +1,19 @@
 from __future__ import annotations
 
-import time
-from typing import Optional, List
+import asyncio
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Callable, Iterable, Any
 
 import sqlalchemy.orm.exc
 from hydra import log
 from hydra.rpc import BaseRPC
 from requests import RequestException
-from sqlalchemy import Column, String, Integer, desc, UniqueConstraint, and_, or_, asc, func
+from sqlalchemy import Column, String, Integer, desc, UniqueConstraint, asc, func, update, delete
 from sqlalchemy.exc import NoResultFound
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from .base import *
 from .db import DB
@@ -25,6 +29,8 @@ class LocalState:
     # 175377 (175378 is NFT TX)
     height = 0
     hash = ""
+    # Hashes of heights processed within the last CONF_MATURE blocks, for fork detection.
+    hashes: Dict[int, str] = {}
 
 
 class Block(Base):
@@ -38,7 +44,7 @@ class Block(Base):
     hash = Column(String(64), nullable=False, unique=True, primary_key=False, index=True)
     conf = Column(Integer, nullable=False, index=True)
     info = DbInfoColumn()
-    tx = DbDataColumn()
+    tx = DbPackedColumn()
 
     addr_hist = relationship(
         "AddrHist",
@@ -50,12 +56,37 @@ class Block(Base):
 
     CONF_MATURE = 501
 
+    # Poll interval in seconds: UPDATE_INTERVAL_MIN after a new block, growing by STEP per idle poll.
+    UPDATE_INTERVAL_MIN = 1
+    UPDATE_INTERVAL_MAX = 5
+    UPDATE_INTERVAL_STEP = 0.5
+
+    # Bounded pool for concurrent RPC lookups, e.g. a block's transactions.
+    RPC_WORKERS = 8
+    __rpc_executor = ThreadPoolExecutor(max_workers=RPC_WORKERS, thread_name_prefix="block-rpc")
+
+    # Block event notifications are sent to the API by a background thread.
+    # On shutdown, wait this many seconds for queued notifications to be sent.
+    NOTIFY_FLUSH_TIMEOUT = 30
+    __notify_queue: queue.Queue = queue.Queue(maxsize=1000)
+    __notify_thread: Optional[threading.Thread] = None
+    __notify_lock = threading.Lock()
+    # Queued notification count per block pkid; those blocks are not deleted until sent.
+    __notify_pending: Dict[int, int] = {}
+
+    # Set when update_task_async() exits, so executor threads stop retrying and catching up.
+    __stop = threading.Event()
+
+    class Stopped(Exception):
+        """Raised in the update thread once the update task is stopping.
+        """
+
     def _removed_hist(self, db: DB):
         if not len(self.addr_hist):
             log.info(f"Deleting block #{self.height} with no history.")
             db.Session.delete(self)
 
-    def on_new_block(self, db: DB, chain_height: int) -> bool:
+    def on_new_block(self, db: DB, chain_height: int, post_commit: List[Callable[[], None]]) -> bool:
         info, txes = None, None
 
         while 1:
@@ -63,63 +94,59 @@ class Block(Base):
             try:
                 info, txes = self.__get_block_info(db)
                 break
+            except Block.Stopped:
+                raise
             except BaseRPC.Exception as exc:
                 if exc.response.status_code == 404:
                     # Block not in explorer yet, so wait for a little while.
                     log.warning(f"Block #{self.height} not in explorer yet, trying again in 10s.")
-                    time.sleep(10)
+                    Block.__wait(10)
                     continue
 
                 log.error(f"RPC error querying explorer API: {str(exc)}. (Retrying in 30s)", exc_info=exc)
-                time.sleep(30)
+                Block.__wait(30)
                 continue
             except BaseException as exc:
                 log.error(f"Error querying explorer API: {str(exc)}. (Retrying in 60s)", exc_info=exc)
-                time.sleep(60)
+                Block.__wait(60)
                 continue
 
-        addresses_hy = set()
-        addresses_hx = set()
+        addresses = {address for tx in txes for address in schemas.Block.tx_yield_addrs(tx)}
+        addresses_hy = {address for address in addresses if len(address) == 34}
+        addresses_hx = {address for address in addresses if len(address) == 40}
 
-        for tx in txes:
-            for address in schemas.Block.tx_yield_addrs(tx):
-                if len(address) == 34:
-                    addresses_hy.add(address)
-                elif len(address) == 40:
-                    addresses_hx.add(address)
-                else:
-                    log.warning(f"Unknown address length {len(address)}: '{address}'")
+        for address in addresses - addresses_hy - addresses_hx:
+            log.warning(f"Unknown address length {len(address)}: '{address}'")
+
+        self.conf = info["confirmations"]
+        del info["confirmations"]
+        self.info = info
+
+        if self.height == chain_height:
+            post_commit.append(lambda: self.make_stat(db))
+
+        from .addr import Addr
+
+        addresses_hy, addresses_hx = Addr.tracked_filter(addresses_hy, addresses_hx)
 
         if not len(addresses_hy) and not len(addresses_hx):
             return False
 
-        from .addr import Addr
+        # Separate IN queries so each can use its column's unique index (an OR would not).
+        addrs: Dict[int, Addr] = {}
 
-        addrs: List[Addr] = db.Session.query(
-            Addr,
-        ).where(
-            and_(
-                # Addr.addr_tp == Addr.Type.H,
-                or_(
-                    Addr.addr_hy.in_(addresses_hy),
-                    Addr.addr_hx.in_(addresses_hx),
-                )
-            )
-        ).all()
+        for column, addresses in ((Addr.addr_hy, addresses_hy), (Addr.addr_hx, addresses_hx)):
+            if len(addresses):
+                for addr in db.Session.query(Addr).where(column.in_(addresses)).all():
+                    addrs[addr.pkid] = addr
 
-        self.conf = info["confirmations"]
-        del info["confirmations"]
-        self.info = info
         self.tx = txes
 
         added_history = False
 
-        for addr in addrs:
+        for addr in addrs.values():
             added_history |= addr.on_block_create(db=db, block=self)
 
-        if self.height == chain_height:
-            self.make_stat(db)
-
         return added_history
 
     def make_stat(self, db: DB):
@@ -143,132 +170,110 @@ class Block(Base):
             log.warning(f"Other Exception while adding new Stat entry: {exc}", exc_info=exc)
 
     def filter_tx(self, address: str):
-        return filter(lambda tx: address in list(schemas.Block.tx_yield_addrs(tx)), self.tx)
+        return schemas.Block.filter_txes(self.tx, address)
 
-    def on_fork(self, db: DB, hash_new: str):
-        if self.hash == hash_new:
-            return
-
-        log.critical(f"Fork detected at height {self.height}: {self.hash} != {hash_new}")
-        log.error(f"Reverting {len(self.addr_hist)} addresses.")
+    def on_fork(self, db: DB):
+        log.error(f"Reverting block #{self.height} with {len(self.addr_hist)} addresses.")
 
         for addr_hist in self.addr_hist:
             addr_hist.on_fork(db)
 
-        height = self.height
-
-        db.Session.delete(self)
-        # Deletes all related addr_hist and user_addr_hist.
-        db.Session.commit()
-
-        log.error(f"Re-processing block #{self.height}")
-
-        Block.make(
-            db=db,
-            height=height,
-            chain_height=-1,
-            block_hash=hash_new
-        )
-
-    def update_confirmations(self, db: DB):
-        block_hash = db.rpc.getblockhash(self.height)
-
-        if self.hash != block_hash:
-            self.on_fork(db, block_hash)
-            return
-
-        try:
-            block_header = db.rpc.getblockheader(blockhash=self.hash)
-        except BaseRPC.Exception as exc:
-            log.warning(f"Block call to getblockheader() failed: {exc}", exc_info=exc)
-            return
-
-        conf = block_header.confirmations
-
-        if conf >= Block.CONF_MATURE:
-
-            while 1:
-                try:
-                    self.conf = conf
-
-                    for addr_hist in self.addr_hist:
-                        addr_hist.on_update_conf(db)
-
-                    db.Session.add(self)
-                    db.Session.commit()
-
-                    break
-
-                except sqlalchemy.exc.SQLAlchemyError as exc:
-                    log.error(
-                        f"Block.update_confirmations(): Got SQL error '{exc}', trying again.", exc_info=exc
-                    )
-
-                    db.Session.rollback()
-
-                    try:
-                        db.Session.refresh(self)
-                        continue
-                    except sqlalchemy.exc.SQLAlchemyError as exc:
-                        log.error(
-                            f"Block.update_confirmations(refresh): Got SQL error '{exc}', not trying again.", exc_info=exc
-                        )
-
-                        return False
+    def update_confirmations(self, db: DB, chain_height: int) -> bool:
+        """Apply confirmations derived from the chain height.
+        Returns True when the block has matured and needs its conf stored.
+        """
+        if chain_height - self.height + 1 < Block.CONF_MATURE:
+            return False
 
-            try:
-                if self.update_confirmations_post_commit(db):
-                    db.Session.commit()
+        for addr_hist in self.addr_hist:
+            addr_hist.on_update_conf(db)
 
-            except sqlalchemy.exc.SQLAlchemyError as exc:
-                log.error(
-                    f"Block.update_confirmations(post-commit): Got SQL error '{exc}', not trying again.", exc_info=exc
-                )
+        return True
 
-    def update_confirmations_post_commit(self, db: DB) -> bool:
+    def update_confirmations_post_commit(self, db: DB, newly_matured: bool) -> bool:
         """Called after bulk commit when update_confirmations() returned True.
+
+        A block is processed as mature in the pass where it first reaches CONF_MATURE,
+        however many blocks that pass spans, and deleted in a later pass so the mature
+        notification can still load it. Deletion also waits while any notification
+        for the block is still queued, e.g. the create event during a long catch-up.
         """
         if self.conf < Block.CONF_MATURE:
             return False
 
-        if self.conf > Block.CONF_MATURE or not len(self.addr_hist):
+        if not newly_matured or not len(self.addr_hist):
+            if Block.notify_pending(self.pkid):
+                log.debug(f"Keep over-mature block #{self.height} until its queued notifications are sent.")
+                return False
+
             log.debug(f"Delete over-mature block #{self.height} with {self.conf} confirmations and {len(self.addr_hist)} hist entries.")
             db.Session.delete(self)
             return True
 
-        if self.conf == Block.CONF_MATURE:  # Decision: Only process when timing is right, to enable self deletion.
-
-            if len(self.addr_hist):
-                for addr_hist in self.addr_hist:
-                    addr_hist.on_block_mature(db)
+        for addr_hist in self.addr_hist:
+            addr_hist.on_block_mature(db)
 
-                try:
-                    db.api.sse_block_notify_mature(block_pk=self.pkid)
-                except BaseRPC.Exception as exc:
-                    log.error(f"Unable to send block mature notify: response={exc.response} error={exc.error}", exc_info=exc)
-                except RequestException as exc:
-                    log.error(f"Unable to send block mature notify: request={exc.request} response={exc.response}", exc_info=exc)
-                except BaseException as exc:
-                    log.error(f"Unable to send block mature notify: {exc}", exc_info=exc)
-                else:
-                    log.debug(f"Sent notification for matured block #{self.pkid}")
+        Block.notify(db, schemas.SSEBlockEvent.mature, self.pkid)
 
         return False
 
     @staticmethod
-    def update_confirmations_all(db: DB):
+    def update_confirmations_all(db: DB, chain_height: Optional[int] = None):
         """Update confirmations on stored blocks.
+
+        Confirmations are computed from the chain height, so matured blocks
+        are stored with one bulk UPDATE and a single commit.
         """
+        if chain_height is None:
+            chain_height = db.rpc.getblockcount()
+
+        from .addr_hist import AddrHist
+
         while 1:
             blocks: List[Block] = db.Session.query(
                 Block
+            ).options(
+                selectinload(Block.addr_hist).selectinload(AddrHist.addr)
             ).order_by(
                 asc(Block.height)
             ).all()
 
             try:
-                for block in blocks:
-                    block.update_confirmations(db)
+                matured: List[Block] = [
+                    block for block in blocks
+                    if block.update_confirmations(db, chain_height)
+                ]
+
+                if not len(matured):
+                    break
+
+                db.Session.execute(
+                    update(
+                        Block
+                    ).where(
+                        Block.pkid.in_([block.pkid for block in matured])
+                    ).values(
+                        conf=chain_height - Block.height + 1
+                    ).execution_options(
+                        synchronize_session=False
+                    )
+                )
+
+                # Stored conf is below CONF_MATURE until the pass in which a block first matures.
+                newly_matured = {block.pkid for block in matured if block.conf < Block.CONF_MATURE}
+
+                for block in matured:
+                    set_committed_value(block, "conf", chain_height - block.height + 1)
+
+                db.Session.commit()
+
+                deleted = False
+
+                for block in matured:
+                    deleted |= block.update_confirmations_post_commit(db, block.pkid in newly_matured)
+
+                if deleted:
+                    db.Session.commit()
 
                 break
 
@@ -297,8 +302,23 @@ class Block(Base):
             return Block.make(db, height)
 
     @staticmethod
-    def make(db: DB, height: int, chain_height: int, block_hash: Optional[str] = None) -> Optional[Block]:
+    def make(
+            db: DB, height: int, chain_height: int, block_hash: Optional[str] = None,
+            post_commit: Optional[List[Callable[[], None]]] = None
+    ) -> Optional[Block]:
+        """Create the block at height if it adds history for tracked addresses.
+
+        When post_commit is given, the block is written in a savepoint of the caller's
+        transaction and its post-commit work (stats, notification) is appended for the
+        caller to run after committing. Otherwise the block is committed here.
+        """
+        batch = post_commit is not None
+
         while 1:
+            pending: List[Callable[[], None]] = []
+            savepoint = db.Session.begin_nested() if batch else None
+            rollback = savepoint.rollback if batch else db.Session.rollback
+
             try:
                 bhash = db.rpc.getblockhash(height) if block_hash is None else block_hash
 
@@ -308,59 +328,151 @@ class Block(Base):
                     hash=bhash,
                 )
 
-                if new_block.on_new_block(db, chain_height):
+                if new_block.on_new_block(db, chain_height, pending):
                     db.Session.add(new_block)
-                    db.Session.commit()
-                    db.Session.refresh(new_block)
-                    log.info(f"Processed block #{new_block.height}  chain: {chain_height}  hist: {len(new_block.addr_hist)}")
 
-                    try:
-                        db.api.sse_block_notify_create(block_pk=new_block.pkid)
-                    except BaseRPC.Exception as exc:
-                        log.error(f"Unable to send block notify: response={exc.response} error={exc.error}", exc_info=exc)
-                    except RequestException as exc:
-                        log.error(f"Unable to send block notify: request={exc.request} response={exc.response}", exc_info=exc)
-                    except BaseException as exc:
-                        log.error(f"Unable to send block notify: {exc}", exc_info=exc)
+                    # No refresh needed: pkid comes back with the INSERT (eager_defaults)
+                    # and addr_hist was populated in on_new_block().
+                    if batch:
+                        savepoint.commit()
                     else:
-                        log.debug(f"Sent notification for new block #{new_block.pkid}")
+                        db.Session.commit()
+
+                    log.info(f"Processed block #{new_block.height}  chain: {chain_height}  hist: {len(new_block.addr_hist)}")
 
+                    pending.append(lambda: new_block.notify_create(db))
+                    Block.__post_commit(pending, post_commit)
                     return new_block
 
             except sqlalchemy.orm.exc.StaleDataError as exc:
                 log.error("Block.make(): Got StaleDataError when attempting to create new block, trying again.", exc_info=exc)
-                db.Session.rollback()
+                rollback()
                 continue
             except sqlalchemy.exc.SQLAlchemyError as exc:
                 log.error(f"Block.make(): Got SQL error {exc}, trying again.", exc_info=exc)
-                db.Session.rollback()
+                rollback()
                 continue
             except BaseRPC.Exception as exc:
                 log.error("Block.make(): RPC error, trying again.", exc_info=exc)
-                db.Session.rollback()
+                rollback()
                 continue
 
             log.debug(f"Discarding block without history entries at height {new_block.height}")
-            db.Session.rollback()
+            rollback()
+            Block.__post_commit(pending, post_commit)
             break
 
     @staticmethod
-    def update_task(db: DB) -> None:
+    def __post_commit(pending: List[Callable[[], None]], post_commit: Optional[List[Callable[[], None]]]) -> None:
+        if post_commit is not None:
+            post_commit.extend(pending)
+            return
+
+        for fn in pending:
+            fn()
+
+    def notify_create(self, db: DB) -> None:
+        Block.notify(db, schemas.SSEBlockEvent.create, self.pkid)
+
+    @staticmethod
+    def notify(db: DB, event: schemas.SSEBlockEvent, block_pk: int) -> None:
+        """Queue a block event notification for the background notify worker.
+        Blocks when the queue is full.
+        """
+        with Block.__notify_lock:
+            if Block.__notify_thread is None:
+                Block.__notify_thread = threading.Thread(
+                    target=Block.__notify_worker, args=(db,), name="block-notify", daemon=True
+                )
+                Block.__notify_thread.start()
+
+            Block.__notify_pending[block_pk] = Block.__notify_pending.get(block_pk, 0) + 1
+
+        Block.__notify_queue.put((event, block_pk))
+
+    @staticmethod
+    def notify_pending(block_pk: int) -> bool:
+        with Block.__notify_lock:
+            return block_pk in Block.__notify_pending
+
+    @staticmethod
+    def __notify_worker(db: DB) -> None:
+        while 1:
+            event, block_pk = Block.__notify_queue.get()
+
+            try:
+                if event == schemas.SSEBlockEvent.create:
+                    db.api.sse_block_notify_create(block_pk=block_pk)
+                else:
+                    db.api.sse_block_notify_mature(block_pk=block_pk)
+            except BaseRPC.Exception as exc:
+                log.error(f"Unable to send block {event} notify: response={exc.response} error={exc.error}", exc_info=exc)
+            except RequestException as exc:
+                log.error(f"Unable to send block {event} notify: request={exc.request} response={exc.response}", exc_info=exc)
+            except BaseException as exc:
+                log.error(f"Unable to send block {event} notify: {exc}", exc_info=exc)
+            else:
+                log.debug(f"Sent {event} notification for block #{block_pk}")
+            finally:
+                with Block.__notify_lock:
+                    if Block.__notify_pending[block_pk] > 1:
+                        Block.__notify_pending[block_pk] -= 1
+                    else:
+                        del Block.__notify_pending[block_pk]
+
+                Block.__notify_queue.task_done()
+
+    @staticmethod
+    def notify_flush(timeout: float) -> bool:
+        """Wait up to `timeout` seconds for queued notifications to be sent.
+        Returns False if some were left unsent.
+        """
+        if Block.__notify_thread is None:
+            return True
+
+        joiner = threading.Thread(target=Block.__notify_queue.join, name="block-notify-flush", daemon=True)
+        joiner.start()
+        joiner.join(timeout)
+
+        if joiner.is_alive():
+            log.warning(f"Dropping {Block.__notify_queue.qsize()} unsent block notification(s) after {timeout}s.")
+            return False
+
+        return True
+
+    @staticmethod
+    async def update_task_async(db: DB) -> None:
+        """Poll for new blocks, backing off while the chain is idle.
+
+        Blocking steps run on executor threads, which asyncio.run() joins at shutdown,
+        so on exit the stop event cuts their retry waits and catch-up short.
+        """
+        Block.__stop.clear()
+
         try:
-            Block.__update_init(db)
+            await db.in_session_async(Block.__update_init, db)
+            await db.in_session_async(Block.update_confirmations_all, db)
 
-            Block.update_confirmations_all(db)
+            idle = 0
 
             while 1:
-                if Block.update(db):
-                    Block.update_confirmations_all(db)
-                time.sleep(1)
+                if await db.in_session_async(Block.update, db):
+                    idle = 0
+                    await db.in_session_async(Block.update_confirmations_all, db, LocalState.height)
+                else:
+                    idle += 1
 
-        except KeyboardInterrupt:
-            pass
+                await asyncio.sleep(min(Block.UPDATE_INTERVAL_MAX, Block.UPDATE_INTERVAL_MIN + idle * Block.UPDATE_INTERVAL_STEP))
+        finally:
+            Block.__stop.set()
+            Block.notify_flush(Block.NOTIFY_FLUSH_TIMEOUT)
 
     @staticmethod
     def __update_init(db: DB) -> None:
+        from .addr import Addr
+
+        Addr.tracked_load(db)
+
         block: Block = db.Session.query(
             Block
         ).order_by(
@@ -374,6 +486,14 @@ class Block(Base):
             if LocalState.height == 0:
                 LocalState.height = db.rpc.getblockcount() - 1
 
+        LocalState.hashes = dict(
+            db.Session.query(
+                Block.height, Block.hash
+            ).filter(
+                Block.height > LocalState.height - Block.CONF_MATURE
+            ).all()
+        )
+
     @staticmethod
     def update(db: DB) -> bool:
 
@@ -382,19 +502,122 @@ class Block(Base):
 
         # log.debug(f"Poll: chain={chain_height} local={LocalState.height}")
 
-        if chain_height == LocalState.height:
-            if LocalState.hash and chain_hash != LocalState.hash:
-                log.warning(f"Fork detected at height {chain_height}: {chain_hash} != {LocalState.hash}")
+        if chain_height == LocalState.height and (not LocalState.hash or chain_hash == LocalState.hash):
+            return False
+
+        fork_height = Block.__fork_height(db, chain_height)
+
+        if fork_height is not None:
+            log.critical(f"Fork detected at height {fork_height} (local={LocalState.height} chain={chain_height})")
+            Block.__fork_revert(db, fork_height)
+
+        from .addr import Addr
+
+        # Addresses may have been added or removed by the API since the last update.
+        Addr.tracked_load(db)
+
+        updated = False
+
+        # Commit every block_batch heights so row locks are held briefly and a failed commit loses one batch.
+        for start in range(LocalState.height + 1, chain_height + 1, db.block_batch):
+            heights = range(start, min(start + db.block_batch, chain_height + 1))
+            hashes = dict(zip(heights, Block.__rpc_map(db.rpc.getblockhash, heights)))
+
+            post_commit: List[Callable[[], None]] = []
+
+            for height in heights:
+                if Block.__stop.is_set():
+                    raise Block.Stopped()
+
+                Block.make(db, height, chain_height, block_hash=hashes[height], post_commit=post_commit)
+
+            try:
+                db.Session.commit()
+            except sqlalchemy.exc.SQLAlchemyError as exc:
+                log.error(f"Block.update(): Got SQL error '{exc}' committing blocks, retrying next update.", exc_info=exc)
+                db.Session.rollback()
+                return updated
+
+            for fn in post_commit:
+                fn()
+
+            LocalState.height = heights[-1]
+            LocalState.hash = hashes[heights[-1]]
+            LocalState.hashes.update(hashes)
+
+            for height in [h for h in LocalState.hashes if h <= LocalState.height - Block.CONF_MATURE]:
+                del LocalState.hashes[height]
+
+            updated = True
+
+        return updated
+
+    @staticmethod
+    def __fork_height(db: DB, chain_height: int) -> Optional[int]:
+        """Find the lowest known height whose hash is no longer on the chain.
+
+        A matching hash at one height implies all lower heights match, so only the
+        newest known height is checked unless it differs, then the window is bisected.
+        """
+        heights = sorted(LocalState.hashes)
+
+        def on_chain(height: int) -> bool:
+            return height <= chain_height and db.rpc.getblockhash(height) == LocalState.hashes[height]
+
+        if not len(heights) or on_chain(heights[-1]):
+            return None
+
+        lo, hi = 0, len(heights) - 1
+
+        while lo < hi:
+            mid = (lo + hi) // 2
+
+            if on_chain(heights[mid]):
+                lo = mid + 1
             else:
-                return False
+                hi = mid
 
-        for height in range(LocalState.height + 1, chain_height + 1):
-            Block.make(db, height, chain_height)
+        return heights[lo]
 
-        LocalState.height = chain_height
-        LocalState.hash = chain_hash
+    @staticmethod
+    def __fork_revert(db: DB, fork_height: int) -> None:
+        """Revert and delete all stored blocks from fork_height up, newest first.
+        """
+        from .addr_hist import AddrHist
 
-        return True
+        blocks: List[Block] = db.Session.query(
+            Block
+        ).options(
+            selectinload(Block.addr_hist).selectinload(AddrHist.addr)
+        ).filter(
+            Block.height >= fork_height
+        ).order_by(
+            desc(Block.height)
+        ).all()
+
+        for block in blocks:
+            block.on_fork(db)
+
+        # Related addr_hist and user_addr_hist rows are removed by ON DELETE CASCADE.
+        db.Session.execute(
+            delete(
+                Block
+            ).where(
+                Block.height >= fork_height
+            ).execution_options(
+                synchronize_session=False
+            )
+        )
+
+        db.Session.commit()
+
+        for height in [h for h in LocalState.hashes if h >= fork_height]:
+            del LocalState.hashes[height]
+
+        LocalState.height = fork_height - 1
+        LocalState.hash = ""
+
+        log.error(f"Reverted {len(blocks)} blocks, re-processing from #{fork_height}")
 
     def __get_block_info(self, db: DB):
         while 1:
@@ -405,13 +628,13 @@ class Block(Base):
 
             if isinstance(info, str):
                 log.warning("get_block_info(): Explorer seems under maintenance, trying again in 30s.")
-                time.sleep(30)
+                Block.__wait(30)
                 continue
 
             if info.height != self.height or info.hash != self.hash:
                 log.warning(f"Block info mismatch at height {self.height}/{self.hash} != {info.height}/{info.hash} -- retrying in 60s.")
                 self.hash = None
-                time.sleep(60)
+                Block.__wait(60)
                 continue
 
             del info.hash
@@ -419,9 +642,7 @@ class Block(Base):
 
             tx = []
 
-            for txid in info.transactions:
-                trxn = db.rpcx.get_tx(txid)
-
+            for txid, trxn in zip(info.transactions, Block.__rpc_map(db.rpcx.get_tx, info.transactions)):
                 if isinstance(trxn, str):
                     log.warning(f"get_block_info({self.height}:{txid}): Transaction could not load, skipping.")
                     continue
@@ -430,3 +651,15 @@ class Block(Base):
 
             return info, tx
 
+    @staticmethod
+    def __wait(seconds: float) -> None:
+        """Sleep before a retry, raising Block.Stopped if the update task stops meanwhile.
+        """
+        if Block.__stop.wait(seconds):
+            raise Block.Stopped()
+
+    @staticmethod
+    def __rpc_map(fn: Callable[[Any], Any], args: Iterable[Any]) -> list:
+        """Call a blocking RPC method for each arg on the shared RPC pool, results in arg order.
+        """
+        return list(Block.__rpc_executor.map(fn, args))
@@ -73,6 +73,10 @@ class User(Base):
         elif not create:
             return None
 
+        return User.make(db, tg_user_id)
+
+    @staticmethod
+    def make(db: DB, tg_user_id: int) -> User:
         while True:
             uniq = UserUniq(db)
 
@@ -150,17 +154,3 @@ class User(Base):
 
     def addr_get(self, db: DB, address: str, create: Union[bool, str] = True) -> Optional[UserAddr]:
         return UserAddr.get(db=db, user=self, address=address, create=create)
-
-    def addr_del(self, db: DB, user_addr_pk: int) -> bool:
-        ua: Optional[UserAddr] = db.Session.query(
-            UserAddr
-        ).where(
-            UserAddr.pkid == user_addr_pk
-        ).one_or_none()
-
-        if ua is not None:
-            ua._remove(db, self.user_addrs)
-            db.Session.commit()
-            return True
-
-        return False
@@ -104,6 +104,10 @@ class UserAddr(Base):
 
         return False
 
+    def delete(self, db: DB):
+        self._remove(db, self.user.user_addrs)
+        db.Session.commit()
+
     def _remove(self, db: DB, user_addrs):
         addr = self.addr
         user_addrs.remove(self)
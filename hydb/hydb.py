@@ -1,5 +1,6 @@
 """Hydra Bot Application.
 """
+import asyncio
 import os
 from argparse import ArgumentParser
 
@@ -39,7 +40,10 @@ class HyDb(HydraApp):
         if self.args.shell:
             return self.shell()
 
-        return Block.update_task(self.db)
+        try:
+            asyncio.run(Block.update_task_async(self.db))
+        except KeyboardInterrupt:
+            pass
 
     def shell(self):
         import sys, traceback, code
@@ -41,6 +41,7 @@ setup(
             "namemaker",
             "sqlalchemy",
             "sqlalchemy-json",
+            "zstandard",
             "psycopg2-binary",
             "alembic[tz]",
             "fastapi",